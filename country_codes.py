@@ -0,0 +1,259 @@
+# ===============================
+# Country Lookup Table
+# ===============================
+
+# ISO 3166-1 alpha-2 code -> country names reported by the geolocation APIs
+COUNTRY_NAMES = {
+    "AD": ("Andorra",),
+    "AE": ("United Arab Emirates", "UAE"),
+    "AF": ("Afghanistan",),
+    "AG": ("Antigua and Barbuda",),
+    "AI": ("Anguilla",),
+    "AL": ("Albania",),
+    "AM": ("Armenia",),
+    "AO": ("Angola",),
+    "AQ": ("Antarctica",),
+    "AR": ("Argentina",),
+    "AS": ("American Samoa",),
+    "AT": ("Austria",),
+    "AU": ("Australia",),
+    "AW": ("Aruba",),
+    "AX": ("Åland", "Aland Islands", "Åland Islands"),
+    "AZ": ("Azerbaijan",),
+    "BA": ("Bosnia and Herzegovina",),
+    "BB": ("Barbados",),
+    "BD": ("Bangladesh",),
+    "BE": ("Belgium",),
+    "BF": ("Burkina Faso",),
+    "BG": ("Bulgaria",),
+    "BH": ("Bahrain",),
+    "BI": ("Burundi",),
+    "BJ": ("Benin",),
+    "BL": ("Saint Barthélemy",),
+    "BM": ("Bermuda",),
+    "BN": ("Brunei", "Brunei Darussalam"),
+    "BO": ("Bolivia",),
+    "BQ": ("Bonaire, Sint Eustatius, and Saba", "Caribbean Netherlands"),
+    "BR": ("Brazil",),
+    "BS": ("Bahamas", "The Bahamas"),
+    "BT": ("Bhutan",),
+    "BW": ("Botswana",),
+    "BY": ("Belarus",),
+    "BZ": ("Belize",),
+    "CA": ("Canada",),
+    "CC": ("Cocos (Keeling) Islands",),
+    "CD": ("DR Congo", "Democratic Republic of the Congo", "Congo (Kinshasa)"),
+    "CF": ("Central African Republic",),
+    "CG": ("Congo", "Republic of the Congo", "Congo (Brazzaville)"),
+    "CH": ("Switzerland",),
+    "CI": ("Ivory Coast", "Côte d'Ivoire", "Cote d'Ivoire"),
+    "CK": ("Cook Islands",),
+    "CL": ("Chile",),
+    "CM": ("Cameroon",),
+    "CN": ("China",),
+    "CO": ("Colombia",),
+    "CR": ("Costa Rica",),
+    "CU": ("Cuba",),
+    "CV": ("Cabo Verde", "Cape Verde"),
+    "CW": ("Curaçao", "Curacao"),
+    "CX": ("Christmas Island",),
+    "CY": ("Cyprus",),
+    "CZ": ("Czechia", "Czech Republic"),
+    "DE": ("Germany",),
+    "DJ": ("Djibouti",),
+    "DK": ("Denmark",),
+    "DM": ("Dominica",),
+    "DO": ("Dominican Republic",),
+    "DZ": ("Algeria",),
+    "EC": ("Ecuador",),
+    "EE": ("Estonia",),
+    "EG": ("Egypt",),
+    "EH": ("Western Sahara",),
+    "ER": ("Eritrea",),
+    "ES": ("Spain",),
+    "ET": ("Ethiopia",),
+    "FI": ("Finland",),
+    "FJ": ("Fiji",),
+    "FK": ("Falkland Islands",),
+    "FM": ("Micronesia", "Federated States of Micronesia"),
+    "FO": ("Faroe Islands",),
+    "FR": ("France",),
+    "GA": ("Gabon",),
+    "GB": ("United Kingdom", "UK", "Great Britain"),
+    "GD": ("Grenada",),
+    "GE": ("Georgia",),
+    "GF": ("French Guiana",),
+    "GG": ("Guernsey",),
+    "GH": ("Ghana",),
+    "GI": ("Gibraltar",),
+    "GL": ("Greenland",),
+    "GM": ("Gambia", "The Gambia"),
+    "GN": ("Guinea",),
+    "GP": ("Guadeloupe",),
+    "GQ": ("Equatorial Guinea",),
+    "GR": ("Greece",),
+    "GT": ("Guatemala",),
+    "GU": ("Guam",),
+    "GW": ("Guinea-Bissau",),
+    "GY": ("Guyana",),
+    "HK": ("Hong Kong",),
+    "HN": ("Honduras",),
+    "HR": ("Croatia",),
+    "HT": ("Haiti",),
+    "HU": ("Hungary",),
+    "ID": ("Indonesia",),
+    "IE": ("Ireland",),
+    "IL": ("Israel",),
+    "IM": ("Isle of Man",),
+    "IN": ("India",),
+    "IQ": ("Iraq",),
+    "IR": ("Iran",),
+    "IS": ("Iceland",),
+    "IT": ("Italy",),
+    "JE": ("Jersey",),
+    "JM": ("Jamaica",),
+    "JO": ("Jordan",),
+    "JP": ("Japan",),
+    "KE": ("Kenya",),
+    "KG": ("Kyrgyzstan",),
+    "KH": ("Cambodia",),
+    "KI": ("Kiribati",),
+    "KM": ("Comoros",),
+    "KN": ("Saint Kitts and Nevis", "St Kitts and Nevis"),
+    "KP": ("North Korea",),
+    "KR": ("South Korea", "Korea", "Republic of Korea"),
+    "KW": ("Kuwait",),
+    "KY": ("Cayman Islands",),
+    "KZ": ("Kazakhstan",),
+    "LA": ("Laos",),
+    "LB": ("Lebanon",),
+    "LC": ("Saint Lucia",),
+    "LI": ("Liechtenstein",),
+    "LK": ("Sri Lanka",),
+    "LR": ("Liberia",),
+    "LS": ("Lesotho",),
+    "LT": ("Lithuania",),
+    "LU": ("Luxembourg",),
+    "LV": ("Latvia",),
+    "LY": ("Libya",),
+    "MA": ("Morocco",),
+    "MC": ("Monaco",),
+    "MD": ("Moldova",),
+    "ME": ("Montenegro",),
+    "MF": ("Saint Martin",),
+    "MG": ("Madagascar",),
+    "MH": ("Marshall Islands",),
+    "MK": ("North Macedonia", "Macedonia"),
+    "ML": ("Mali",),
+    "MM": ("Myanmar", "Burma"),
+    "MN": ("Mongolia",),
+    "MO": ("Macao", "Macau"),
+    "MP": ("Northern Mariana Islands",),
+    "MQ": ("Martinique",),
+    "MR": ("Mauritania",),
+    "MS": ("Montserrat",),
+    "MT": ("Malta",),
+    "MU": ("Mauritius",),
+    "MV": ("Maldives",),
+    "MW": ("Malawi",),
+    "MX": ("Mexico",),
+    "MY": ("Malaysia",),
+    "MZ": ("Mozambique",),
+    "NA": ("Namibia",),
+    "NC": ("New Caledonia",),
+    "NE": ("Niger",),
+    "NF": ("Norfolk Island",),
+    "NG": ("Nigeria",),
+    "NI": ("Nicaragua",),
+    "NL": ("Netherlands", "The Netherlands"),
+    "NO": ("Norway",),
+    "NP": ("Nepal",),
+    "NR": ("Nauru",),
+    "NU": ("Niue",),
+    "NZ": ("New Zealand",),
+    "OM": ("Oman",),
+    "PA": ("Panama",),
+    "PE": ("Peru",),
+    "PF": ("French Polynesia",),
+    "PG": ("Papua New Guinea",),
+    "PH": ("Philippines",),
+    "PK": ("Pakistan",),
+    "PL": ("Poland",),
+    "PM": ("Saint Pierre and Miquelon",),
+    "PR": ("Puerto Rico",),
+    "PS": ("Palestine",),
+    "PT": ("Portugal",),
+    "PW": ("Palau",),
+    "PY": ("Paraguay",),
+    "QA": ("Qatar",),
+    "RE": ("Réunion", "Reunion"),
+    "RO": ("Romania",),
+    "RS": ("Serbia",),
+    "RU": ("Russia", "Russian Federation"),
+    "RW": ("Rwanda",),
+    "SA": ("Saudi Arabia",),
+    "SB": ("Solomon Islands",),
+    "SC": ("Seychelles",),
+    "SD": ("Sudan",),
+    "SE": ("Sweden",),
+    "SG": ("Singapore",),
+    "SH": ("Saint Helena",),
+    "SI": ("Slovenia",),
+    "SK": ("Slovakia",),
+    "SL": ("Sierra Leone",),
+    "SM": ("San Marino",),
+    "SN": ("Senegal",),
+    "SO": ("Somalia",),
+    "SR": ("Suriname",),
+    "SS": ("South Sudan",),
+    "ST": ("São Tomé and Príncipe", "Sao Tome and Principe"),
+    "SV": ("El Salvador",),
+    "SX": ("Sint Maarten",),
+    "SY": ("Syria",),
+    "SZ": ("Eswatini", "Swaziland"),
+    "TC": ("Turks and Caicos Islands",),
+    "TD": ("Chad",),
+    "TG": ("Togo",),
+    "TH": ("Thailand",),
+    "TJ": ("Tajikistan",),
+    "TL": ("Timor-Leste", "East Timor"),
+    "TM": ("Turkmenistan",),
+    "TN": ("Tunisia",),
+    "TO": ("Tonga",),
+    "TR": ("Turkey", "Türkiye"),
+    "TT": ("Trinidad and Tobago",),
+    "TV": ("Tuvalu",),
+    "TW": ("Taiwan",),
+    "TZ": ("Tanzania",),
+    "UA": ("Ukraine",),
+    "UG": ("Uganda",),
+    "US": ("United States", "United States of America", "USA"),
+    "UY": ("Uruguay",),
+    "UZ": ("Uzbekistan",),
+    "VA": ("Vatican City", "Holy See"),
+    "VC": ("Saint Vincent and the Grenadines",),
+    "VE": ("Venezuela",),
+    "VG": ("British Virgin Islands",),
+    "VI": ("U.S. Virgin Islands", "US Virgin Islands"),
+    "VN": ("Vietnam", "Viet Nam"),
+    "VU": ("Vanuatu",),
+    "WF": ("Wallis and Futuna",),
+    "WS": ("Samoa",),
+    "XK": ("Kosovo",),
+    "YE": ("Yemen",),
+    "YT": ("Mayotte",),
+    "ZA": ("South Africa",),
+    "ZM": ("Zambia",),
+    "ZW": ("Zimbabwe",),
+}
+
+def build_country_codes(country_names):
+    """Precompute a lookup from every code and name (as given and casefolded) to its code."""
+    codes = {}
+    for code, names in country_names.items():
+        for key in (code, *names):
+            codes[key] = code
+            codes[key.casefold()] = code
+    return codes
+
+COUNTRY_CODES = build_country_codes(COUNTRY_NAMES)
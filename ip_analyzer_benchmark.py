@@ -0,0 +1,125 @@
+import json
+import timeit
+
+import requests
+
+# NOTE: Ensure your main file is named 'ip_analyzer_ver2.py'
+from ip_analyzer_ver2 import PROVIDERS
+
+# ===============================
+# Sample Payloads
+# ===============================
+
+SAMPLE_PAYLOADS = {
+    "ipwho.is": {
+        "ip": "1.1.1.1", "success": True, "type": "IPv4", "continent": "North America",
+        "country": "United States", "country_code": "US", "region": "California", "city": "Los Angeles",
+        "latitude": 34.0522342, "longitude": -118.2436849, "is_eu": False, "postal": "90001",
+        "connection": {"asn": 13335, "org": "APNIC and Cloudflare DNS Resolver project",
+                       "isp": "Cloudflare, Inc.", "domain": "cloudflare.com"},
+        "timezone": {"id": "America/Los_Angeles", "abbr": "PDT", "is_dst": True, "offset": -25200,
+                     "utc": "-07:00", "current_time": "2024-05-01T05:30:00-07:00"},
+    },
+    "ipapi.co": {
+        "ip": "1.1.1.1", "network": "1.1.1.0/24", "version": "IPv4", "city": "Los Angeles",
+        "region": "California", "region_code": "CA", "country": "US", "country_name": "United States",
+        "country_code": "US", "postal": "90001", "latitude": 34.0522, "longitude": -118.2437,
+        "timezone": "America/Los_Angeles", "utc_offset": "-0700", "currency": "USD",
+        "asn": "AS13335", "org": "CLOUDFLARENET",
+    },
+    "ipinfo.io": {
+        "ip": "1.1.1.1", "hostname": "one.one.one.one", "city": "Los Angeles", "region": "California",
+        "country": "US", "loc": "34.0522,-118.2437", "org": "AS13335 Cloudflare, Inc.",
+        "postal": "90076", "timezone": "America/Los_Angeles", "anycast": True,
+    },
+}
+
+# ===============================
+# Baseline Mapping (before the provider registry)
+# ===============================
+
+def baseline_ipwho(data):
+    if not data or not data.get("success", False):
+        return None
+    return {
+        "source": "ipwho.is",
+        "ip": data.get("ip"),
+        "country": data.get("country"),
+        "region": data.get("region"),
+        "city": data.get("city"),
+        "isp": data.get("connection", {}).get("isp"),
+        "asn": data.get("connection", {}).get("asn"),
+        "type": data.get("type"),
+        "timezone": data.get("timezone", {}).get("id"),
+        "latitude": data.get("latitude"),
+        "longitude": data.get("longitude"),
+    }
+
+def baseline_ipapi(data):
+    if not data or "error" in data:
+        return None
+    return {
+        "source": "ipapi.co",
+        "ip": data.get("ip"),
+        "country": data.get("country_name"),
+        "region": data.get("region"),
+        "city": data.get("city"),
+        "isp": data.get("org"),
+        "asn": data.get("asn"),
+        "type": data.get("version"),
+        "timezone": data.get("timezone"),
+        "latitude": data.get("latitude"),
+        "longitude": data.get("longitude"),
+    }
+
+def baseline_ipinfo(data):
+    if not data:
+        return None
+    loc = data.get("loc", ",").split(",")
+    return {
+        "source": "ipinfo.io",
+        "ip": data.get("ip"),
+        "country": data.get("country"),
+        "region": data.get("region"),
+        "city": data.get("city"),
+        "isp": data.get("org"),
+        "asn": data.get("asn"),
+        "type": "IPv6" if ":" in str(data.get("ip")) else "IPv4",
+        "timezone": data.get("timezone"),
+        "latitude": loc[0] if len(loc) > 0 else None,
+        "longitude": loc[1] if len(loc) > 1 else None,
+    }
+
+BASELINE = {"ipwho.is": baseline_ipwho, "ipapi.co": baseline_ipapi, "ipinfo.io": baseline_ipinfo}
+
+# ===============================
+# Benchmark
+# ===============================
+
+def make_response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(payload).encode("utf-8")
+    return response
+
+def best_time(func, number, repeat=9):
+    """Best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def run_benchmark(number=20000):
+    print(f"{'provider':<10} {'step':<18} {'baseline':>10} {'registry':>10}")
+    for source, payload in SAMPLE_PAYLOADS.items():
+        response = make_response(payload)
+        baseline = BASELINE[source]
+        extract = PROVIDERS[source]["extract"]
+        rows = [
+            ("decode", lambda: response.json(), lambda: json.loads(response.content)),
+            ("normalize", lambda: baseline(payload), lambda: extract(payload)),
+            ("decode+normalize", lambda: baseline(response.json()), lambda: extract(json.loads(response.content))),
+        ]
+        for step, old, new in rows:
+            print(f"{source:<10} {step:<18} {best_time(old, number):>8.2f}us {best_time(new, number):>8.2f}us")
+
+if __name__ == "__main__":
+    run_benchmark()
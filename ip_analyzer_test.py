@@ -1,6 +1,19 @@
+import os
+import tempfile
+import contextlib
+import io
 import unittest
+from datetime import datetime
+from unittest import mock
 # NOTE: Ensure your main file is named 'ip_analyzer_ver2.py'
-from ip_analyzer_ver2 import validate_ip, analyze_consistency, privacy_exposure_score
+from ip_analyzer_ver2 import (validate_ip, analyze_consistency, privacy_exposure_score,
+                              PROVIDERS, normalize_asn, compile_extractor, to_float, build_export_rows, export_results,
+                              main, run_analysis, register_provider, normalize_country, max_distances_km, geo_agreement_scores)
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 # Mock API results used for testing analysis functions
 # MOCK_RESULT_1 and MOCK_RESULT_2_SAME share country 'US' and timezone 'America/Los_Angeles' (IPv4)
@@ -70,6 +83,262 @@ class TestAnalyzerFunctions(unittest.TestCase):
         self.assertIn("IPv6 detected", notes[1])
         self.assertIn("Timezone inconsistency", notes[2])
 
+    # --- Test Cases for provider normalization ---
+    def test_ipinfo_record_is_typed(self):
+        """ipinfo.io's "loc" string is split into numeric coordinates and the ASN taken from "org"."""
+        data = {"ip": "1.1.1.1", "country": "US", "city": "Los Angeles",
+                "org": "AS13335 Cloudflare, Inc.", "timezone": "America/Los_Angeles",
+                "loc": "34.0522,-118.2437"}
+        record = PROVIDERS["ipinfo.io"]["extract"](data)
+        self.assertEqual(record["source"], "ipinfo.io")
+        self.assertEqual(record["latitude"], 34.0522)
+        self.assertEqual(record["longitude"], -118.2437)
+        self.assertEqual(record["asn"], "AS13335")
+        self.assertEqual(record["type"], "IPv4")
+
+    def test_ipwho_nested_fields(self):
+        """Nested paths are resolved and a failed lookup yields no record."""
+        data = {"success": True, "ip": "2606:4700::1111", "type": "IPv6", "country": "United States",
+                "connection": {"isp": "Cloudflare", "asn": 13335},
+                "timezone": {"id": "America/Los_Angeles"}, "latitude": 34.05, "longitude": -118.24}
+        record = PROVIDERS["ipwho.is"]["extract"](data)
+        self.assertEqual(record["isp"], "Cloudflare")
+        self.assertEqual(record["asn"], "AS13335")
+        self.assertEqual(record["timezone"], "America/Los_Angeles")
+        self.assertIsNone(PROVIDERS["ipwho.is"]["extract"]({"success": False}))
+        self.assertIsNone(PROVIDERS["ipapi.co"]["extract"]({"error": True, "reason": "RateLimited"}))
+
+    def test_normalize_asn(self):
+        """ASNs from every provider format map to the same "AS<number>" string."""
+        self.assertEqual(normalize_asn(13335), "AS13335")
+        self.assertEqual(normalize_asn("AS13335"), "AS13335")
+        self.assertEqual(normalize_asn("as13335 Cloudflare"), "AS13335")
+        self.assertIsNone(normalize_asn("Cloudflare"))
+        self.assertEqual(normalize_asn("AS 13335"), "AS13335")
+        self.assertEqual(normalize_asn(" as 13335 Cloudflare"), "AS13335")
+        self.assertEqual(normalize_asn(13335.0), "AS13335")
+        self.assertIsNone(normalize_asn(13335.5))
+        self.assertIsNone(normalize_asn(float("nan")))
+        self.assertIsNone(normalize_asn(-5))
+        self.assertIsNone(normalize_asn("AS-5"))
+        self.assertIsNone(normalize_asn(""))
+        self.assertIsNone(normalize_asn(None))
+
+    def test_extractor_options_are_per_provider(self):
+        """The "loc" split and ASN-from-org fallback only apply when a provider declares them."""
+        fields = {"ip": "ip", "isp": "org", "asn": "asn", "latitude": "lat", "longitude": "lon"}
+        extract = compile_extractor("example", fields)
+        record = extract({"ip": "1.1.1.1", "org": "AS13335 Cloudflare", "lat": 1.5, "lon": "2.5"})
+        self.assertIsNone(record["asn"])
+        self.assertEqual((record["latitude"], record["longitude"]), (1.5, 2.5))
+
+        extract = compile_extractor("example", {"ip": "ip", "isp": "org"}, coordinates="geo.loc", asn_from="org")
+        record = extract({"ip": "::1", "org": "AS13335 Cloudflare", "geo": {"loc": "1.5,2.5"}})
+        self.assertEqual(record["asn"], "AS13335")
+        self.assertEqual((record["latitude"], record["longitude"]), (1.5, 2.5))
+        self.assertEqual(record["type"], "IPv6")
+
+        with self.assertRaises(ValueError):
+            compile_extractor("example", {"loc": "loc"})
+
+    def test_invalid_coordinates_are_rejected(self):
+        """Non-finite and out-of-range coordinates become None."""
+        self.assertIsNone(to_float("nan", 90))
+        self.assertIsNone(to_float(float("inf"), 180))
+        self.assertIsNone(to_float(91.0, 90))
+        self.assertIsNone(to_float("-180.5", 180))
+        self.assertEqual(to_float("-90", 90), -90.0)
+        record = PROVIDERS["ipapi.co"]["extract"]({"ip": "1.1.1.1", "latitude": "nan", "longitude": float("nan")})
+        self.assertIsNone(record["latitude"])
+        self.assertIsNone(record["longitude"])
+        record = PROVIDERS["ipinfo.io"]["extract"]({"ip": "1.1.1.1", "loc": "95.0,inf"})
+        self.assertIsNone(record["latitude"])
+        self.assertIsNone(record["longitude"])
+
+    def test_registered_provider_is_queried(self):
+        """A provider added with register_provider is part of every analysis."""
+        register_provider("example.test", "https://example.test/{ip}", "https://example.test/",
+                          {"ip": "addr", "country": "geo.country", "isp": "net.name", "asn": "net.asn"})
+        self.addCleanup(PROVIDERS.pop, "example.test")
+
+        def fake_fetch_json(url):
+            if "example.test" in url:
+                return {"addr": "1.1.1.1", "geo": {"country": "US"}, "net": {"name": "Cloudflare", "asn": 13335}}
+            return None
+
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            os.chdir(directory)  # digital_footprint_log.txt is written to the working directory
+            try:
+                with mock.patch("ip_analyzer_ver2.fetch_json", side_effect=fake_fetch_json), \
+                        contextlib.redirect_stdout(io.StringIO()) as output:
+                    rows = run_analysis("1.1.1.1")
+            finally:
+                os.chdir(cwd)
+
+        self.assertIn("--- EXAMPLE.TEST ---", output.getvalue())
+        self.assertEqual([row["source"] for row in rows], ["example.test"])
+        self.assertEqual(rows[0]["asn"], "AS13335")
+
+    # --- Test Cases for columnar export ---
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_export_parquet_partitioned_by_date(self):
+        """Export rows are written per date with dictionary-encoded columns and privacy flags."""
+        import pyarrow.parquet as pq
+        results = [dict(MOCK_RESULT_1, source="ipwho.is", asn=13335, latitude="34.05", longitude=-118.24),
+                   dict(MOCK_RESULT_3_DIFFERENT, source="ipinfo.io", asn="AS2914", latitude=35.68, longitude=139.69)]
+        score, notes = privacy_exposure_score(results)
+        rows = build_export_rows(results, 50.0, score, notes, datetime(2024, 5, 1, 12, 30))
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = export_results(rows, directory, row_group_size=1)
+            self.assertEqual(len(paths), 1)
+            self.assertEqual(os.path.basename(os.path.dirname(paths[0])), "date=2024-05-01")
+            parquet_file = pq.ParquetFile(paths[0])
+            self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+            table = parquet_file.read()
+
+        self.assertEqual(str(table.schema.field("country").type), "dictionary<values=string, indices=int32, ordered=0>")
+        self.assertEqual(table.column("latitude").to_pylist(), [34.05, 35.68])
+        self.assertEqual(table.column("asn").to_pylist(), ["AS13335", "AS2914"])
+        self.assertEqual(table.column("country_code").to_pylist(), ["US", "JP"])
+        self.assertEqual(str(table.schema.field("country_code").type), "dictionary<values=string, indices=int32, ordered=0>")
+        self.assertEqual(table.column("privacy_score").to_pylist(), [score, score])
+        self.assertEqual(table.column("ipv6").to_pylist(), [True, True])
+        self.assertEqual(table.column("missing_isp").to_pylist(), [False, False])
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_export_arrow_ipc(self):
+        """Arrow IPC output round-trips the same rows."""
+        rows = build_export_rows([dict(MOCK_RESULT_1, source="ipapi.co", asn=None, latitude=None, longitude=None)],
+                                 100.0, 100, [], datetime(2024, 5, 2))
+        with tempfile.TemporaryDirectory() as directory:
+            paths = export_results(rows, directory, file_format="arrow")
+            with pyarrow.ipc.open_file(paths[0]) as reader:
+                table = reader.read_all()
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table.column("source").to_pylist(), ["ipapi.co"])
+        self.assertIsNone(table.column("latitude")[0].as_py())
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_batch_run_exports_one_file_per_run(self):
+        """`--batch --export` analyzes every IP and writes each run's rows to a new part file."""
+        import pyarrow.parquet as pq
+        payloads = {
+            "ipwho.is": {"success": True, "ip": "1.1.1.1", "type": "IPv4", "country": "United States",
+                         "connection": {"isp": "Cloudflare", "asn": 13335},
+                         "timezone": {"id": "America/Los_Angeles"}, "latitude": 34.05, "longitude": -118.24},
+            "ipapi.co": {"ip": "1.1.1.1", "version": "IPv4", "country_name": "United States", "org": "CLOUDFLARENET",
+                         "asn": "AS13335", "timezone": "America/Los_Angeles", "latitude": 34.05, "longitude": -118.24},
+            "ipinfo.io": {"ip": "1.1.1.1", "country": "US", "org": "AS13335 Cloudflare, Inc.",
+                          "timezone": "America/Los_Angeles", "loc": "34.0522,-118.2437"},
+        }
+
+        def fake_fetch_json(url):
+            return next(payload for host, payload in payloads.items() if host in url)
+
+        with tempfile.TemporaryDirectory() as directory:
+            ip_file = os.path.join(directory, "ips.txt")
+            with open(ip_file, "w", encoding="utf-8") as f:
+                f.write("1.1.1.1\n8.8.8.8\nnot-an-ip\n\n")
+            export_dir = os.path.join(directory, "export")
+            argv = ["--batch", ip_file, "--export", "parquet", "--export-dir", export_dir]
+
+            cwd = os.getcwd()
+            os.chdir(directory)  # digital_footprint_log.txt is written to the working directory
+            try:
+                with mock.patch("ip_analyzer_ver2.fetch_json", side_effect=fake_fetch_json), \
+                        mock.patch("ip_analyzer_ver2.geo_agreement_scores", wraps=geo_agreement_scores) as batch_scores, \
+                        mock.patch("ip_analyzer_ver2.geo_agreement_score") as run_score, \
+                        contextlib.redirect_stdout(io.StringIO()) as output:
+                    main(argv)
+                    main(argv)
+            finally:
+                os.chdir(cwd)
+
+            self.assertIn("Skipping invalid IP address: not-an-ip", output.getvalue())
+            # Each run scores its whole batch (2 valid IPs) in one call
+            self.assertEqual([len(call.args[0]) for call in batch_scores.call_args_list], [2, 2])
+            run_score.assert_not_called()
+            partitions = os.listdir(export_dir)
+            self.assertEqual(len(partitions), 1)
+            folder = os.path.join(export_dir, partitions[0])
+            files = sorted(os.listdir(folder))
+            self.assertEqual(len(files), 2)
+            self.assertTrue(all(name.startswith("part-") and name.endswith(".parquet") for name in files))
+            # 2 valid IPs x 3 providers per run
+            self.assertEqual([pq.ParquetFile(os.path.join(folder, name)).metadata.num_rows for name in files], [6, 6])
+            table = pq.read_table(folder)
+
+        self.assertEqual(set(table.column("asn").to_pylist()), {"AS13335"})
+        # ipwho/ipapi report "United States", ipinfo reports "US"
+        self.assertEqual(set(table.column("country").to_pylist()), {"United States", "US"})
+        self.assertEqual(set(table.column("country_code").to_pylist()), {"US"})
+        self.assertEqual(set(table.column("geo_score").to_pylist()), {100.0})
+
+    # --- Test Cases for geographic agreement ---
+    def test_normalize_country(self):
+        """Country names and codes from different APIs map to the same ISO code."""
+        self.assertEqual(normalize_country("United States"), "US")
+        self.assertEqual(normalize_country("us"), "US")
+        self.assertEqual(normalize_country("Czech Republic"), "CZ")
+        self.assertEqual(normalize_country("Atlantis"), "Atlantis")
+
+    def test_consistency_uses_normalized_countries(self):
+        """"US" and "United States" are no longer counted as a disagreement."""
+        results = [MOCK_RESULT_1, dict(MOCK_RESULT_2_SAME, country="United States")]
+        summary, score = analyze_consistency(results)
+        self.assertAlmostEqual(score, 100.0)
+        score, notes = privacy_exposure_score(results)
+        self.assertEqual(score, 100)
+
+    def test_consistency_reports_provider_country_name(self):
+        """The summary names the country as an API reported it, not as its ISO code."""
+        results = [dict(MOCK_RESULT_1, country="United States"), MOCK_RESULT_2_SAME,
+                   dict(MOCK_RESULT_1, country="United States")]
+        summary, _ = analyze_consistency(results)
+        self.assertIn("Most APIs report your location as United States.", summary)
+
+    def test_explicit_geo_score_is_not_recomputed(self):
+        """Passing geo_score=None (no coordinates) skips the distance computation."""
+        with mock.patch("ip_analyzer_ver2.geo_agreement_score", return_value=None) as geo_agreement_score:
+            analyze_consistency([MOCK_RESULT_1], geo_score=None)
+            privacy_exposure_score([MOCK_RESULT_1], geo_score=None)
+            geo_agreement_score.assert_not_called()
+            privacy_exposure_score([MOCK_RESULT_1])
+            geo_agreement_score.assert_called_once()
+
+    def test_geo_threshold_constant(self):
+        """The dispersion penalty follows GEO_AGREEMENT_MIN_SCORE."""
+        with mock.patch("ip_analyzer_ver2.GEO_AGREEMENT_MIN_SCORE", 80):
+            score, notes = privacy_exposure_score([MOCK_RESULT_1], geo_score=70.0)
+        self.assertEqual(score, 90)
+        score, notes = privacy_exposure_score([MOCK_RESULT_1], geo_score=70.0)
+        self.assertEqual(score, 100)
+
+    def test_geo_agreement_batch(self):
+        """Distances and scores are computed per run across a whole batch."""
+        los_angeles = dict(MOCK_RESULT_1, latitude=34.0522, longitude=-118.2437)
+        santa_monica = dict(MOCK_RESULT_1, latitude="34.0195", longitude="-118.4912")
+        tokyo = dict(MOCK_RESULT_3_DIFFERENT, latitude=35.6762, longitude=139.6503)
+        batch = [[los_angeles, santa_monica], [los_angeles, santa_monica, tokyo], [los_angeles], [MOCK_RESULT_1]]
+
+        distances = max_distances_km(batch)
+        self.assertAlmostEqual(distances[0], 23.1, delta=0.5)
+        self.assertAlmostEqual(distances[1], 8815, delta=10)
+        self.assertIsNone(distances[2])
+        self.assertEqual(geo_agreement_scores(batch), [100.0, 0.0, None, None])
+
+    def test_privacy_score_geo_dispersion(self):
+        """Far-apart provider coordinates cost 10 points even when countries match."""
+        results = [dict(MOCK_RESULT_1, latitude=34.05, longitude=-118.24),
+                   dict(MOCK_RESULT_2_SAME, latitude=40.71, longitude=-74.01)]
+        score, notes = privacy_exposure_score(results)
+        self.assertEqual(score, 90)
+        self.assertIn("Provider coordinates are far apart", notes[0])
+        summary, _ = analyze_consistency(results, geo_score=0.0)
+        self.assertIn("Provider coordinates are far apart", summary)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,11 @@
+import argparse
+import json
+import math
+import os
 import requests
 import ipaddress
 from datetime import datetime
+from country_codes import COUNTRY_CODES, COUNTRY_NAMES
 
 # ===============================
 # Utility Functions 
@@ -19,76 +24,272 @@ def fetch_json(url):
     try:
         response = requests.get(url, headers={"User-Agent": "DigitalFootprintAnalyzer/3.0"})
         response.raise_for_status()
-        return response.json()
-    except requests.RequestException:
+        # json.loads detects UTF-8/16/32 from the raw bytes, skipping requests' charset guessing
+        return json.loads(response.content)
+    except (requests.RequestException, ValueError):
         return None
 
 # ===============================
 # Data Collection from APIs 
 # ===============================
 
-def get_ipwho(ip=None):
-    data = fetch_json(f"https://ipwho.is/{ip}" if ip else "https://ipwho.is/")
-    if not data or not data.get("success", False):
+# Each provider is described by its URLs and a field mapping. A mapping value is a
+# dotted path into the provider's JSON ("connection.isp"). Optional settings:
+# "require" names a key that must be truthy, "reject" a key that must be absent,
+# "coordinates" is the path of a "lat,lon" string to split into latitude and longitude,
+# and "asn_from" is a path whose "AS<number> ..." prefix is used when no ASN is reported.
+PROVIDERS = {}
+
+RECORD_FIELDS = ("ip", "country", "region", "city", "isp", "asn", "type",
+                 "timezone", "latitude", "longitude")
+
+def to_float(value, limit=None):
+    """Convert a coordinate to float, returning None for missing, non-finite or out-of-range values."""
+    if value is None or value == "":
         return None
-    return {
-        "source": "ipwho.is",
-        "ip": data.get("ip"),
-        "country": data.get("country"),
-        "region": data.get("region"),
-        "city": data.get("city"),
-        "isp": data.get("connection", {}).get("isp"),
-        "asn": data.get("connection", {}).get("asn"),
-        "type": data.get("type"),
-        "timezone": data.get("timezone", {}).get("id"),
-        "latitude": data.get("latitude"),
-        "longitude": data.get("longitude"),
-    }
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(value) or (limit is not None and abs(value) > limit):
+        return None
+    return value
 
-def get_ipapi(ip=None):
-    data = fetch_json(f"https://ipapi.co/{ip}/json/" if ip else "https://ipapi.co/json/")
-    if not data or "error" in data:
+def normalize_asn(value):
+    """Normalize an ASN given as 13335, 13335.0, "13335" or "AS 13335 Cloudflare" to "AS13335"."""
+    if value is None or isinstance(value, bool):
         return None
-    return {
-        "source": "ipapi.co",
-        "ip": data.get("ip"),
-        "country": data.get("country_name"),
-        "region": data.get("region"),
-        "city": data.get("city"),
-        "isp": data.get("org"),
-        "asn": data.get("asn"),
-        "type": data.get("version"),
-        "timezone": data.get("timezone"),
-        "latitude": data.get("latitude"),
-        "longitude": data.get("longitude"),
+    if isinstance(value, float):
+        if not value.is_integer():
+            return None
+        value = int(value)
+    if isinstance(value, int):
+        return f"AS{value}" if value >= 0 else None
+    if isinstance(value, str) and value.startswith("AS") and value[2:].isdigit() and value.isascii():
+        return value
+    text = str(value).strip()
+    if text[:2].upper() == "AS":
+        text = text[2:].lstrip()
+    number = text.split(maxsplit=1)[0] if text else ""
+    return f"AS{number}" if number.isdigit() and number.isascii() else None
+
+def lookup_path(data, keys):
+    """Follow a sequence of keys through nested dicts, returning None when a level is missing."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def compile_extractor(source, fields, require=None, reject=None, coordinates=None, asn_from=None):
+    """Compile a field mapping into a function turning decoded JSON into a record.
+
+    Paths are split once here; normalization steps only run when the mapping needs them.
+    """
+    unknown = set(fields) - set(RECORD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown record fields for {source}: {', '.join(sorted(unknown))}")
+
+    # Top-level keys are read with a plain dict lookup; only nested paths go through lookup_path
+    paths = [(field, tuple(path.split("."))) for field, path in fields.items()]
+    flat = tuple((field, keys[0]) for field, keys in paths if len(keys) == 1)
+    nested = tuple((field, keys) for field, keys in paths if len(keys) > 1)
+    coordinate_keys = tuple(coordinates.split(".")) if coordinates else None
+    asn_keys = tuple(asn_from.split(".")) if asn_from else None
+    check_coordinates = "latitude" in fields or "longitude" in fields
+    check_asn = "asn" in fields
+    type_from_ip = "type" not in fields
+    template = dict.fromkeys(("source",) + RECORD_FIELDS)
+    template["source"] = source
+
+    def extract(data):
+        if not isinstance(data, dict):
+            return None
+        if require and not data.get(require, False):
+            return None
+        if reject and reject in data:
+            return None
+
+        get = data.get
+        record = template.copy()
+        for field, key in flat:
+            record[field] = get(key)
+        for field, keys in nested:
+            record[field] = lookup_path(data, keys)
+
+        if coordinate_keys:
+            lat, _, lon = str(lookup_path(data, coordinate_keys) or "").partition(",")
+            record["latitude"] = to_float(lat, 90)
+            record["longitude"] = to_float(lon, 180)
+        elif check_coordinates:
+            record["latitude"] = to_float(record["latitude"], 90)
+            record["longitude"] = to_float(record["longitude"], 180)
+
+        if check_asn:
+            record["asn"] = normalize_asn(record["asn"])
+        if asn_keys and record["asn"] is None:
+            record["asn"] = normalize_asn(lookup_path(data, asn_keys))
+        if type_from_ip:
+            record["type"] = "IPv6" if ":" in str(record["ip"]) else "IPv4"
+        return record
+
+    return extract
+
+def register_provider(source, url, public_url, fields, require=None, reject=None,
+                      coordinates=None, asn_from=None):
+    """Add a provider to the registry. `url` is formatted with the IP being analyzed."""
+    PROVIDERS[source] = {
+        "url": url,
+        "public_url": public_url,
+        "extract": compile_extractor(source, fields, require, reject, coordinates, asn_from),
     }
 
+def fetch_provider(source, ip=None):
+    """Query a registered provider and return its normalized record, or None."""
+    provider = PROVIDERS[source]
+    data = fetch_json(provider["url"].format(ip=ip) if ip else provider["public_url"])
+    return provider["extract"](data) if data else None
+
+register_provider(
+    "ipwho.is", "https://ipwho.is/{ip}", "https://ipwho.is/",
+    {
+        "ip": "ip",
+        "country": "country",
+        "region": "region",
+        "city": "city",
+        "isp": "connection.isp",
+        "asn": "connection.asn",
+        "type": "type",
+        "timezone": "timezone.id",
+        "latitude": "latitude",
+        "longitude": "longitude",
+    },
+    require="success",
+)
+
+register_provider(
+    "ipapi.co", "https://ipapi.co/{ip}/json/", "https://ipapi.co/json/",
+    {
+        "ip": "ip",
+        "country": "country_name",
+        "region": "region",
+        "city": "city",
+        "isp": "org",
+        "asn": "asn",
+        "type": "version",
+        "timezone": "timezone",
+        "latitude": "latitude",
+        "longitude": "longitude",
+    },
+    reject="error",
+)
+
+register_provider(
+    "ipinfo.io", "https://ipinfo.io/{ip}/json", "https://ipinfo.io/json",
+    {
+        "ip": "ip",
+        "country": "country",
+        "region": "region",
+        "city": "city",
+        "isp": "org",
+        "asn": "asn",
+        "timezone": "timezone",
+    },
+    coordinates="loc",
+    # ipinfo.io's free tier only exposes the ASN as a prefix of "org"
+    asn_from="org",
+)
+
+def get_ipwho(ip=None):
+    return fetch_provider("ipwho.is", ip)
+
+def get_ipapi(ip=None):
+    return fetch_provider("ipapi.co", ip)
+
 def get_ipinfo(ip=None):
-    data = fetch_json(f"https://ipinfo.io/{ip}/json" if ip else "https://ipinfo.io/json")
-    if not data:
-        return None
-    loc = data.get("loc", ",").split(",")
-    return {
-        "source": "ipinfo.io",
-        "ip": data.get("ip"),
-        "country": data.get("country"),
-        "region": data.get("region"),
-        "city": data.get("city"),
-        "isp": data.get("org"),
-        "asn": data.get("asn"),
-        "type": "IPv6" if ":" in str(data.get("ip")) else "IPv4",
-        "timezone": data.get("timezone"),
-        "latitude": loc[0] if len(loc) > 0 else None,
-        "longitude": loc[1] if len(loc) > 1 else None,
-    }
+    return fetch_provider("ipinfo.io", ip)
 
 # ===============================
 # Analysis Functions 
 # ===============================
 
-def analyze_consistency(results):
-    """Compare country and city consistency between APIs"""
-    countries = [r["country"] for r in results if r]
+# Note text per privacy flag; the flag names are also the export column names
+PRIVACY_NOTES = {
+    "geo_mismatch": "Inconsistent geolocation across APIs — potential anonymization detected.",
+    "geo_dispersion": "Provider coordinates are far apart — location may be masked or unreliable.",
+    "ipv6": "IPv6 detected — can expose more precise network details.",
+    "missing_isp": "Missing ISP data — reduced transparency in network identity.",
+    "timezone_mismatch": "Timezone inconsistency — possible VPN or region masking.",
+}
+
+# Provider coordinates closer than NEAR_KM fully agree; FAR_KM apart or more do not agree at all
+GEO_AGREEMENT_NEAR_KM = 50
+GEO_AGREEMENT_FAR_KM = 1000
+# Agreement scores below this trigger the dispersion warning and privacy penalty
+GEO_AGREEMENT_MIN_SCORE = 50
+EARTH_RADIUS_KM = 6371.0
+
+def normalize_country(country):
+    """Map a country name or code ("United States", "us") to its ISO code via COUNTRY_CODES."""
+    code = COUNTRY_CODES.get(country)
+    if code is None and isinstance(country, str):
+        code = COUNTRY_CODES.get(country.casefold())
+    return code or country
+
+def max_distances_km(batch):
+    """Largest great-circle distance between provider coordinates for each run in a batch.
+
+    `batch` is a list of result lists. Runs with fewer than two coordinate pairs get None.
+    This is plain Python, one run at a time; the batch form lets callers score a whole
+    --batch run in one call.
+    """
+    distances = []
+    for results in batch:
+        # Convert every coordinate once so each pair only costs the haversine terms
+        points = []
+        for r in results:
+            lat = to_float(r.get("latitude"), 90) if r else None
+            lon = to_float(r.get("longitude"), 180) if r else None
+            if lat is not None and lon is not None:
+                lat, lon = math.radians(lat), math.radians(lon)
+                points.append((lat, lon, math.cos(lat)))
+        if len(points) < 2:
+            distances.append(None)
+            continue
+        # Haversine: hav = sin²(Δlat/2) + cos(lat1)·cos(lat2)·sin²(Δlon/2)
+        largest = max(
+            math.sin((lat2 - lat1) / 2) ** 2 + cos1 * cos2 * math.sin((lon2 - lon1) / 2) ** 2
+            for i, (lat1, lon1, cos1) in enumerate(points)
+            for lat2, lon2, cos2 in points[i + 1:]
+        )
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(largest, 1.0))))
+    return distances
+
+def geo_agreement_scores(batch):
+    """Distance-based agreement score (0-100) for each run in a batch, or None without coordinates."""
+    span = GEO_AGREEMENT_FAR_KM - GEO_AGREEMENT_NEAR_KM
+    return [
+        None if distance is None
+        else round(100 * min(max((GEO_AGREEMENT_FAR_KM - distance) / span, 0.0), 1.0), 2)
+        for distance in max_distances_km(batch)
+    ]
+
+def geo_agreement_score(results):
+    """Distance-based agreement score for a single run."""
+    return geo_agreement_scores([results])[0]
+
+# Default for `geo_score` arguments: compute the score from the results. None means
+# the score was computed and the results have too few coordinates to compare.
+COMPUTE_GEO_SCORE = object()
+
+def analyze_consistency(results, geo_score=COMPUTE_GEO_SCORE):
+    """Compare country and city consistency between APIs.
+
+    `geo_score` is the result of geo_agreement_score(results); it is computed when omitted.
+    """
+    # Count by ISO code so "US" and "United States" agree, but report a name the APIs used
+    names = [r["country"] for r in results if r]
+    countries = [normalize_country(name) for name in names]
     cities = [r["city"] for r in results if r]
     isps = [r["isp"] for r in results if r]
 
@@ -98,7 +299,11 @@ def analyze_consistency(results):
     common_country = max(set(countries), key=countries.count)
     consistency = (countries.count(common_country) / len(countries)) * 100
 
-    message = f"Most APIs report your location as {common_country}."
+    # Most common original spelling for the winning code, preferring the longer (full) name on ties
+    common_names = [name for name, code in zip(names, countries) if code == common_country]
+    display_name = max(set(common_names), key=lambda name: (common_names.count(name), len(str(name))))
+
+    message = f"Most APIs report your location as {display_name}."
     if consistency < 50:
         message += " 🌐 Possible VPN or proxy detected — your data varies significantly."
     elif consistency < 80:
@@ -106,14 +311,23 @@ def analyze_consistency(results):
     else:
         message += " ✅ High confidence in this location."
 
+    # Compare the reported coordinates, not just the country names
+    if geo_score is COMPUTE_GEO_SCORE:
+        geo_score = geo_agreement_score(results)
+    if geo_score is not None and geo_score < GEO_AGREEMENT_MIN_SCORE:
+        message += " 📍 Provider coordinates are far apart — the reported position is unreliable."
+
     # Detect ISP anomalies
     if len(set(isps)) > 1:
         message += f" Multiple ISPs detected ({', '.join(set(isps))}), which might indicate network rerouting."
 
     return message, round(consistency, 2)
 
-def privacy_exposure_score(results):
-    """Estimate a basic privacy exposure score based on metadata consistency and traceability."""
+def privacy_exposure_score(results, geo_score=COMPUTE_GEO_SCORE):
+    """Estimate a basic privacy exposure score based on metadata consistency and traceability.
+
+    `geo_score` is the result of geo_agreement_score(results); it is computed when omitted.
+    """
     score = 100
     notes = []
 
@@ -121,26 +335,33 @@ def privacy_exposure_score(results):
         return 0, ["No data available."]
 
     # Lower score for mismatched countries
-    countries = [r["country"] for r in results if r]
+    countries = [normalize_country(r["country"]) for r in results if r]
     if len(set(countries)) > 1:
         score -= 20
-        notes.append("Inconsistent geolocation across APIs — potential anonymization detected.")
+        notes.append(PRIVACY_NOTES["geo_mismatch"])
+
+    # Lower score if provider coordinates are far apart
+    if geo_score is COMPUTE_GEO_SCORE:
+        geo_score = geo_agreement_score(results)
+    if geo_score is not None and geo_score < GEO_AGREEMENT_MIN_SCORE:
+        score -= 10
+        notes.append(PRIVACY_NOTES["geo_dispersion"])
 
     # Lower score if using IPv6 (less common, but can leak device-level info)
     if any(r["type"] == "IPv6" for r in results):
         score -= 10
-        notes.append("IPv6 detected — can expose more precise network details.")
+        notes.append(PRIVACY_NOTES["ipv6"])
 
     # Lower score if ISP info missing
     if any(not r["isp"] for r in results):
         score -= 10
-        notes.append("Missing ISP data — reduced transparency in network identity.")
+        notes.append(PRIVACY_NOTES["missing_isp"])
 
     # Lower score if timezone mismatch
     timezones = [r["timezone"] for r in results if r and r["timezone"]]
     if len(set(timezones)) > 1:
         score -= 15
-        notes.append("Timezone inconsistency — possible VPN or region masking.")
+        notes.append(PRIVACY_NOTES["timezone_mismatch"])
 
     # Cap score
     score = max(score, 0)
@@ -159,7 +380,7 @@ def print_ip_info(info):
     print(f"Timezone: {info['timezone']}")
     print(f"Coordinates: {info['latitude']}, {info['longitude']}")
 
-def log_results(results, summary, consistency_score, privacy_score, privacy_notes):
+def log_results(results, summary, consistency_score, privacy_score, privacy_notes, geo_score=None):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with open("digital_footprint_log.txt", "a", encoding="utf-8") as f:
         f.write(f"\n=== Digital Footprint Report ({timestamp}) ===\n")
@@ -175,6 +396,8 @@ def log_results(results, summary, consistency_score, privacy_score, privacy_note
             else:
                 f.write("\n[FAILED TO RETRIEVE DATA]\n")
         f.write(f"\nLocation Consistency: {consistency_score}%\n")
+        if geo_score is not None:
+            f.write(f"Geographic Agreement: {geo_score}%\n")
         f.write(f"Summary: {summary}\n")
         f.write(f"\nPrivacy Exposure Score: {privacy_score}/100\n")
         if privacy_notes:
@@ -182,40 +405,121 @@ def log_results(results, summary, consistency_score, privacy_score, privacy_note
         f.write("=" * 60 + "\n")
 
 # ===============================
-# Main Program 
+# Columnar Export 
 # ===============================
 
-if __name__ == "__main__":
-    print("🔍 Running Digital Footprint Analyzer...\n")
+# Low-cardinality text columns are dictionary encoded in both Parquet and Arrow IPC output
+EXPORT_DICTIONARY_COLUMNS = ("country", "country_code", "isp", "timezone")
+
+def build_export_rows(results, consistency_score, privacy_score, privacy_notes, timestamp=None,
+                      geo_score=None):
+    """Flatten one analysis run into export rows, one per provider record."""
+    timestamp = timestamp or datetime.now()
+    flags = {flag: note in privacy_notes for flag, note in PRIVACY_NOTES.items()}
+    rows = []
+    for info in results:
+        if not info:
+            continue
+        row = {"timestamp": timestamp, "date": timestamp.strftime("%Y-%m-%d"), "source": info["source"]}
+        for field in RECORD_FIELDS:
+            row[field] = info.get(field)
+        # ISO code next to the provider's own spelling, None when the name is unknown
+        code = normalize_country(row["country"])
+        row["country_code"] = code if code in COUNTRY_NAMES else None
+        row["latitude"] = to_float(row["latitude"], 90)
+        row["longitude"] = to_float(row["longitude"], 180)
+        row["asn"] = normalize_asn(row["asn"])
+        row["consistency_score"] = float(consistency_score)
+        row["geo_score"] = None if geo_score is None else float(geo_score)
+        row["privacy_score"] = int(privacy_score)
+        row.update(flags)
+        rows.append(row)
+    return rows
+
+def export_schema(pa):
+    """Arrow schema shared by the Parquet and Arrow IPC exports."""
+    text = pa.string()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    fields = [("timestamp", pa.timestamp("s")), ("source", dictionary)]
+    for field in RECORD_FIELDS:
+        if field in ("latitude", "longitude"):
+            fields.append((field, pa.float64()))
+        else:
+            fields.append((field, dictionary if field in EXPORT_DICTIONARY_COLUMNS else text))
+        if field == "country":
+            fields.append(("country_code", dictionary))
+    fields += [("consistency_score", pa.float64()), ("geo_score", pa.float64()), ("privacy_score", pa.int64())]
+    fields += [(flag, pa.bool_()) for flag in PRIVACY_NOTES]
+    return pa.schema(fields)
+
+def export_results(rows, directory="footprint_export", file_format="parquet", row_group_size=10000):
+    """Write export rows as Parquet or Arrow IPC files partitioned by date.
+
+    Each call writes one new file per date, <directory>/date=YYYY-MM-DD/part-<time>-<pid>.<format>,
+    so concurrent runs never overwrite each other and the cost only depends on the new rows.
+    Use --batch to get large files; merging small files is left to the query engine.
+    Returns the list of written paths. Requires the optional pyarrow package.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Columnar export requires pyarrow (pip install pyarrow).") from None
+    if file_format not in ("parquet", "arrow"):
+        raise ValueError(f"Unsupported export format: {file_format}")
+
+    schema = export_schema(pa)
+    partitions = {}
+    for row in rows:
+        partitions.setdefault(row["date"], []).append(row)
+
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    paths = []
+    for date, partition in sorted(partitions.items()):
+        folder = os.path.join(directory, f"date={date}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"part-{stamp}-{os.getpid()}.{file_format}")
+        table = pa.Table.from_pylist(partition, schema=schema)
+        if file_format == "parquet":
+            pq.write_table(table, path, row_group_size=row_group_size,
+                           use_dictionary=["source", *EXPORT_DICTIONARY_COLUMNS], compression="zstd")
+        else:
+            with pa.ipc.new_file(path, schema) as writer:
+                writer.write_table(table, max_chunksize=row_group_size)
+        paths.append(path)
+    return paths
+
+# ===============================
+# Main Program 
+# ===============================
 
-    # --- NEW USER INPUT LOGIC ---
+def prompt_for_ip():
+    """Ask for an IP address; returns None to analyze the public IP."""
     while True:
         # Prompt user for an IP address or accept empty input for public IP
         ip_input = input("Enter an IP address to analyze (or press Enter for your public IP): ").strip()
 
         if not ip_input:
-            # If input is empty, analyzed_ip remains None, and APIs use the public IP by default.
-            analyzed_ip = None
-            break
+            # If input is empty, APIs use the public IP by default.
+            return None
         
         # Validate the input
         if validate_ip(ip_input):
-            analyzed_ip = ip_input
-            print(f"Analyzing IP: {analyzed_ip}")
-            break
+            print(f"Analyzing IP: {ip_input}")
+            return ip_input
         else:
             print("❌ Invalid IP address format. Please try again.")
 
+def fetch_results(analyzed_ip):
+    """Query every registered provider; failed providers are returned as None."""
     # --- API CALLS ---
     print("\nFetching data from external APIs...")
     
-    # Pass the determined IP (or None) to the data collection functions
-    ipwho = get_ipwho(analyzed_ip)
-    ipapi = get_ipapi(analyzed_ip)
-    ipinfo = get_ipinfo(analyzed_ip)
-
-    results = [ipwho, ipapi, ipinfo]
+    # Pass the determined IP (or None) to every registered provider
+    return [fetch_provider(source, analyzed_ip) for source in PROVIDERS]
 
+def report_analysis(results, geo_score=COMPUTE_GEO_SCORE):
+    """Print, analyze and log one run's results. Returns its export rows (empty if every API failed)."""
     for r in results:
         if r:
             print_ip_info(r)
@@ -225,22 +529,69 @@ if __name__ == "__main__":
     # Filter out failed results for analysis
     successful_results = [r for r in results if r]
     
-    if successful_results:
-        summary, consistency_score = analyze_consistency(successful_results)
-        privacy_score, privacy_notes = privacy_exposure_score(successful_results)
-
-        print("\n=== Analysis Summary ===")
-        print(summary)
-        print(f"Location Consistency Score: {consistency_score}%")
-        print(f"Privacy Exposure Score: {privacy_score}/100")
-        if privacy_notes:
-            print("Notes:")
-            for note in privacy_notes:
-                print(" -", note)
+    if not successful_results:
+        print("\n🔴 FATAL ERROR: Unable to retrieve data from any API. Analysis aborted.")
+        return []
+
+    if geo_score is COMPUTE_GEO_SCORE:
+        geo_score = geo_agreement_score(successful_results)
+    summary, consistency_score = analyze_consistency(successful_results, geo_score)
+    privacy_score, privacy_notes = privacy_exposure_score(successful_results, geo_score)
+
+    print("\n=== Analysis Summary ===")
+    print(summary)
+    print(f"Location Consistency Score: {consistency_score}%")
+    if geo_score is not None:
+        print(f"Geographic Agreement Score: {geo_score}%")
+    print(f"Privacy Exposure Score: {privacy_score}/100")
+    if privacy_notes:
+        print("Notes:")
+        for note in privacy_notes:
+            print(" -", note)
+
+    log_results(successful_results, summary, consistency_score, privacy_score, privacy_notes, geo_score)
+    print("\n🗂️ Results saved to digital_footprint_log.txt ✅")
+    return build_export_rows(successful_results, consistency_score, privacy_score, privacy_notes,
+                             geo_score=geo_score)
+
+def run_analysis(analyzed_ip):
+    """Fetch, print and log one analysis. Returns its export rows (empty if every API failed)."""
+    return report_analysis(fetch_results(analyzed_ip))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Digital Footprint Analyzer")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="analyze every IP address listed in FILE (one per line) instead of prompting")
+    parser.add_argument("--export", choices=("parquet", "arrow"),
+                        help="also write the results as columnar files (requires pyarrow)")
+    parser.add_argument("--export-dir", default="footprint_export",
+                        help="directory for the date-partitioned export (default: footprint_export)")
+    args = parser.parse_args(argv)
+
+    print("🔍 Running Digital Footprint Analyzer...\n")
 
-        log_results(successful_results, summary, consistency_score, privacy_score, privacy_notes)
-        print("\n🗂️ Results saved to digital_footprint_log.txt ✅")
+    if args.batch:
+        with open(args.batch, encoding="utf-8") as f:
+            ips = [line.strip() for line in f if line.strip()]
+        invalid = [ip for ip in ips if not validate_ip(ip)]
+        for ip in invalid:
+            print(f"❌ Skipping invalid IP address: {ip}")
+        ips = [ip for ip in ips if validate_ip(ip)]
     else:
+        ips = [prompt_for_ip()]
 
-        print("\n🔴 FATAL ERROR: Unable to retrieve data from any API. Analysis aborted.")
+    # Fetch every run first so geographic agreement is scored for the whole batch in one call
+    all_results = [fetch_results(ip) for ip in ips]
+    geo_scores = geo_agreement_scores(all_results)
+
+    # Rows from the whole batch are exported together so files get full row groups
+    rows = []
+    for results, geo_score in zip(all_results, geo_scores):
+        rows.extend(report_analysis(results, geo_score))
 
+    if args.export and rows:
+        paths = export_results(rows, args.export_dir, args.export)
+        print(f"📦 Exported {len(rows)} rows to {', '.join(paths)} ✅")
+
+if __name__ == "__main__":
+    main()